@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Window-Size Auto-Tuning for Automotive Sensor Fusion Quality Scoring
+Picks the cheapest quality-scoring configuration that meets the latency budget
+
+This module provides:
+1. Benchmarking of candidate artifact/drift windows and scoring chunk lengths on the target machine
+2. Quality tolerance check against the reference (default) configuration's fusion confidences
+3. Selection of the fastest configuration within tolerance and under the 10 ms budget
+4. JSON persistence of the tuned configuration per deployment tier
+"""
+
+import os
+import json
+import argparse
+import time
+import itertools
+import numpy as np
+import pandas as pd
+from experimental_validation import SensorFusionFramework
+from performance_metrics import PerformanceMetrics
+import warnings
+warnings.filterwarnings('ignore')
+
+REFERENCE_CONFIG = {'window_size': None, 'artifact_window': 64, 'drift_window': 128}
+
+
+def fusion_confidences(instance, signals):
+    """
+    Raw (unnormalized) per-sensor fusion confidences from an instance's quality scoring path
+    Only quality scoring is timed; the weighted sum of the signals is not part of it
+    """
+    if isinstance(instance, PerformanceMetrics):
+        quality = instance.comprehensive_quality_assessment(signals)
+        confidences = {name: instance.compute_fusion_confidence(m) for name, m in quality.items()}
+    else:
+        confidences = instance.compute_fusion_confidence(instance.compute_quality_metrics(signals))
+    return np.array([confidences[name] for name in signals])
+
+
+class QualityWindowAutoTuner:
+    """
+    Benchmark candidate window sizes and chunk lengths, keeping the fastest one within tolerance
+    """
+
+    def __init__(self, target_cls=SensorFusionFramework, artifact_windows=(16, 32, 64, 128),
+                 drift_windows=(32, 64, 128, 256), chunk_lengths=(256, 512, 1024, 2048, None),
+                 tolerance=0.05, latency_budget=10e-3, repeats=5, sampling_rate=100,
+                 min_speedup=0.10):
+        self.target_cls = target_cls
+        self.artifact_windows = artifact_windows
+        self.drift_windows = drift_windows
+        self.chunk_lengths = chunk_lengths  # window_size candidates (None = whole signal)
+        self.tolerance = tolerance  # max absolute deviation in any sensor's fusion confidence
+        self.latency_budget = latency_budget  # 10ms for autonomous vehicles (perception stack)
+        self.repeats = repeats
+        self.sampling_rate = sampling_rate
+        self.min_speedup = min_speedup  # fraction faster than the reference needed to replace it
+
+    def candidates(self, n_samples):
+        """
+        Valid candidate configurations (drift scoring needs two drift windows per chunk)
+        Chunks at or above the signal length are the same as scoring the whole signal and are skipped
+        """
+        for chunk, artifact, drift in itertools.product(
+                self.chunk_lengths, self.artifact_windows, self.drift_windows):
+            if chunk is not None and (chunk >= n_samples or artifact > chunk or 2 * drift > chunk):
+                continue
+            config = {'window_size': chunk, 'artifact_window': artifact, 'drift_window': drift}
+            if config != REFERENCE_CONFIG:
+                yield config
+
+    def _measure(self, instance, signals):
+        fusion_confidences(instance, signals)  # warmup
+        samples = []
+        for _ in range(self.repeats):
+            start_time = time.perf_counter()
+            confidences = fusion_confidences(instance, signals)
+            samples.append(time.perf_counter() - start_time)
+        return confidences, float(np.median(samples))
+
+    def tune(self, signals):
+        """
+        Benchmark every candidate on the given signals and return (best_config, results_df)
+        Signals should be seeded and as long as what the deployment scores per call
+
+        The reference configuration is kept unless a candidate is at least min_speedup faster,
+        so that timing noise between near-identical configurations does not decide the result.
+        best_config is None when no candidate meets both the tolerance and the budget
+        """
+        n_samples = len(next(iter(signals.values())))
+        reference = self.target_cls(sampling_rate=self.sampling_rate, **REFERENCE_CONFIG)
+        reference_confidences, reference_latency = self._measure(reference, signals)
+
+        rows = [{
+            **REFERENCE_CONFIG,
+            'latency_ms': reference_latency * 1000,
+            'max_confidence_deviation': 0.0,
+            'within_tolerance': True,
+            'within_budget': bool(reference_latency < self.latency_budget),
+            'reference': True,
+        }]
+        for config in self.candidates(n_samples):
+            instance = self.target_cls(sampling_rate=self.sampling_rate, **config)
+            confidences, latency = self._measure(instance, signals)
+            deviation = float(np.nanmax(np.abs(confidences - reference_confidences)))
+
+            rows.append({
+                **config,
+                'latency_ms': latency * 1000,
+                'max_confidence_deviation': deviation,
+                'within_tolerance': bool(deviation <= self.tolerance),
+                'within_budget': bool(latency < self.latency_budget),
+                'reference': False,
+            })
+
+        results_df = pd.DataFrame(rows).sort_values('latency_ms').reset_index(drop=True)
+        eligible = results_df[results_df['within_tolerance'] & results_df['within_budget']]
+        if eligible.empty:
+            return None, results_df
+
+        best = eligible.iloc[0]
+        reference_row = results_df[results_df['reference']].iloc[0]
+        if (reference_row['within_budget']
+                and best['latency_ms'] > reference_row['latency_ms'] * (1 - self.min_speedup)):
+            best = reference_row
+        best_config = {key: (None if pd.isna(best[key]) else int(best[key]))
+                       for key in REFERENCE_CONFIG}
+        return best_config, results_df
+
+
+def save_tuned_config(path, tier, config, latency_ms=None):
+    """
+    Store the tuned configuration for a deployment tier, keeping other tiers intact
+    """
+    tiers = load_tuned_configs(path)
+    tiers[tier] = {'config': config, 'latency_ms': latency_ms,
+                   'tuned_at': time.strftime('%Y-%m-%dT%H:%M:%S')}
+    with open(path, 'w') as f:
+        json.dump(tiers, f, indent=2)
+
+
+def load_tuned_configs(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_tier_config(path, tier):
+    """
+    Window configuration tuned for a deployment tier, as constructor keyword arguments
+    """
+    tiers = load_tuned_configs(path)
+    if tier not in tiers:
+        raise KeyError(f"No tuned configuration for tier '{tier}' in '{path}'")
+    return dict(tiers[tier]['config'])
+
+
+def main(argv=None):
+    """
+    Main auto-tuning function
+    """
+    parser = argparse.ArgumentParser(description='Auto-tune quality-scoring windows for a deployment tier')
+    parser.add_argument('--tier', default='default', help='deployment tier name, e.g. edge or central')
+    parser.add_argument('--target', choices=['framework', 'metrics'], default='framework')
+    parser.add_argument('--budget-ms', type=float, default=10.0)
+    parser.add_argument('--tolerance', type=float, default=0.05)
+    parser.add_argument('--duration', type=float, default=600.0,
+                        help='seconds of sensor data scored per call on the target deployment')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='tuned_windows.json')
+    args = parser.parse_args(argv)
+
+    print("Starting Quality-Scoring Window Auto-Tuning for Automotive Sensor Fusion")
+    print("="*60)
+
+    framework = SensorFusionFramework()
+    np.random.seed(args.seed)
+    _, lidar, radar, camera, imu, gps = framework.generate_synthetic_automotive_signals(duration=args.duration)
+    signals = {'lidar': lidar, 'radar': radar, 'camera': camera, 'imu': imu, 'gps': gps}
+
+    target_cls = PerformanceMetrics if args.target == 'metrics' else SensorFusionFramework
+    tuner = QualityWindowAutoTuner(target_cls=target_cls, tolerance=args.tolerance,
+                                   latency_budget=args.budget_ms / 1000)
+    best_config, results_df = tuner.tune(signals)
+
+    print(f"\n{'Chunk':<8} {'Artifact':<10} {'Drift':<8} {'Time (ms)':<10} {'Max Δ conf':<12} {'Eligible':<8}")
+    print("-" * 60)
+    for _, row in results_df.iterrows():
+        chunk = 'all' if pd.isna(row['window_size']) else int(row['window_size'])
+        eligible = row['within_tolerance'] and row['within_budget']
+        print(f"{chunk!s:<8} {row['artifact_window']:<10} {row['drift_window']:<8} "
+              f"{row['latency_ms']:<10.3f} {row['max_confidence_deviation']:<12.4f} "
+              f"{'YES' if eligible else 'NO':<8}{' (reference)' if row['reference'] else ''}")
+
+    if best_config is None:
+        print("\nNo configuration meets the quality tolerance within the latency budget")
+        return results_df
+
+    best_row = results_df[(results_df['window_size'].isna() if best_config['window_size'] is None
+                           else results_df['window_size'] == best_config['window_size'])
+                          & (results_df['artifact_window'] == best_config['artifact_window'])
+                          & (results_df['drift_window'] == best_config['drift_window'])]
+    best_latency = best_row['latency_ms'].iloc[0]
+    print(f"\nSelected configuration for tier '{args.tier}': {best_config} ({best_latency:.3f} ms)")
+    save_tuned_config(args.output, args.tier, best_config, float(best_latency))
+    print(f"Configuration saved to '{args.output}'")
+
+    return results_df
+
+if __name__ == "__main__":
+    results = main()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Performance Regression Benchmark Suite for Automotive Sensor Fusion Framework
+Repeatable timings with stored per-machine baselines
+
+This module provides:
+1. Benchmarks for quality assessment, each fusion method, evaluation and end-to-end runs
+2. Sweeps over signal lengths (1e3 to 1e8 samples) and channel counts
+3. JSON baselines stored per machine
+4. Detection of statistically significant slowdowns (Mann-Whitney U) and memory growth
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import platform
+import argparse
+import tracemalloc
+from math import comb
+import numpy as np
+from scipy.stats import mannwhitneyu
+from experimental_validation import SensorFusionFramework
+from performance_metrics import PerformanceMetrics
+import warnings
+warnings.filterwarnings('ignore')
+
+SENSOR_NAMES = ('lidar', 'radar', 'camera', 'imu', 'gps')
+DEFAULT_LENGTHS = (1_000, 10_000, 100_000, 1_000_000)
+FULL_LENGTHS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+DEFAULT_CHANNELS = (5, 16)
+
+
+def machine_id():
+    """
+    Stable identifier for the current machine, used to key baseline files
+    """
+    fingerprint = '|'.join([platform.node(), platform.machine(), platform.processor(),
+                            platform.python_version(), str(os.cpu_count())])
+    return f"{platform.node() or 'machine'}-{hashlib.sha1(fingerprint.encode()).hexdigest()[:10]}"
+
+
+def make_signals(n_samples, n_channels, sampling_rate=100, noise_level=0.1, seed=0):
+    """
+    Synthetic automotive signals of arbitrary length; extra channels reuse the sensor profiles
+    Extra channels are views of the base arrays (no case mutates its inputs), so large sweeps
+    do not pay for copies
+    """
+    framework = SensorFusionFramework(sampling_rate=sampling_rate)
+    np.random.seed(seed)
+    _, *base = framework.generate_synthetic_automotive_signals(n_samples / sampling_rate, noise_level)
+
+    signals = {}
+    for c in range(n_channels):
+        name = SENSOR_NAMES[c] if c < len(SENSOR_NAMES) else f"sensor_{c}"
+        signals[name] = base[c % len(base)]
+    return signals
+
+
+def ground_truth_for(signals):
+    """
+    Ideal fusion using the fixed automotive weights (unknown channels get no weight)
+    """
+    weights = SensorFusionFramework().fusion_weights
+    truth = np.zeros_like(next(iter(signals.values())))
+    for name, signal in signals.items():
+        truth += weights.get(name, 0.0) * signal
+    return truth
+
+
+class BenchmarkSuite:
+    """
+    Registry of benchmark cases swept over signal lengths and channel counts
+    """
+
+    def __init__(self, lengths=DEFAULT_LENGTHS, channels=DEFAULT_CHANNELS, repeats=7,
+                 min_time=0.0, max_time=60.0, min_samples=6):
+        self.lengths = tuple(lengths)
+        self.channels = tuple(channels)
+        self.repeats = repeats
+        self.min_time = min_time  # keep repeating until this much time has been measured
+        self.max_time = max_time  # stop repeating early once a case exceeds this budget
+        self.min_samples = min_samples  # never stop before this many samples (keeps the test usable)
+        self.framework = SensorFusionFramework()
+        self.metrics = PerformanceMetrics()
+        self.cases = self._default_cases()
+
+    def _default_cases(self):
+        """
+        name -> (setup(signals) -> args, function(*args))
+        """
+        fw, pm = self.framework, self.metrics
+
+        def quality_inputs(signals):
+            return (signals,)
+
+        def fused_inputs(signals):
+            truth = ground_truth_for(signals)
+            fused, _ = fw.confidence_weighted_fusion(signals, fw.compute_quality_metrics(signals))
+            return truth, fused, 'benchmark'
+
+        def fusion_inputs(signals):
+            return signals, fw.compute_quality_metrics(signals)
+
+        def end_to_end(signals):
+            quality = fw.compute_quality_metrics(signals)
+            fused, _ = fw.confidence_weighted_fusion(signals, quality)
+            return fw.evaluate_fusion_performance(ground_truth_for(signals), fused, 'benchmark')
+
+        return {
+            'quality.compute_quality_metrics': (quality_inputs, fw.compute_quality_metrics),
+            'quality.comprehensive_quality_assessment': (
+                quality_inputs, pm.comprehensive_quality_assessment),
+            'fusion.confidence_weighted': (fusion_inputs, fw.confidence_weighted_fusion),
+            'fusion.pm_confidence_weighted': (quality_inputs, pm._confidence_weighted_fusion),
+            'fusion.simple_concatenation': (quality_inputs, fw.simple_concatenation_fusion),
+            'fusion.simple_average': (quality_inputs, pm._simple_average_fusion),
+            'fusion.weighted_average': (quality_inputs, pm._weighted_average_fusion),
+            'evaluation.evaluate_fusion_performance': (fused_inputs, fw.evaluate_fusion_performance),
+            'end_to_end.confidence_weighted': (quality_inputs, end_to_end),
+        }
+
+    def _time_case(self, function, args):
+        """
+        Wall-clock samples for repeated calls, plus peak traced memory of one extra call
+        """
+        function(*args)  # warmup
+
+        samples = []
+        start = time.perf_counter()
+        while len(samples) < self.repeats or time.perf_counter() - start < self.min_time:
+            t0 = time.perf_counter()
+            function(*args)
+            samples.append(time.perf_counter() - t0)
+            if time.perf_counter() - start > self.max_time and len(samples) >= self.min_samples:
+                break
+
+        tracemalloc.start()
+        function(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return samples, peak
+
+    def run(self, cases=None):
+        """
+        Run the selected cases (default: all) over every length and channel count
+        """
+        selected = {name: case for name, case in self.cases.items()
+                    if cases is None or any(name.startswith(c) for c in cases)}
+        results = {}
+
+        for n_samples in self.lengths:
+            for n_channels in self.channels:
+                signals = make_signals(n_samples, n_channels)
+
+                for name, (setup, function) in selected.items():
+                    key = f"{name}[n={n_samples},ch={n_channels}]"
+                    print(f"Running {key}")
+                    samples, peak = self._time_case(function, setup(signals))
+                    results[key] = {
+                        'case': name,
+                        'n_samples': n_samples,
+                        'n_channels': n_channels,
+                        'times': samples,
+                        'median_time': float(np.median(samples)),
+                        'peak_memory_bytes': int(peak),
+                    }
+
+                del signals
+
+        return results
+
+
+def baseline_path(baseline_dir, machine=None):
+    return os.path.join(baseline_dir, f"{machine or machine_id()}.json")
+
+
+def save_baseline(results, baseline_dir, machine=None):
+    """
+    Store benchmark results as the baseline for this machine
+    """
+    os.makedirs(baseline_dir, exist_ok=True)
+    path = baseline_path(baseline_dir, machine)
+    payload = {
+        'machine': machine or machine_id(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+def load_baseline(baseline_dir, machine=None):
+    path = baseline_path(baseline_dir, machine)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare_to_baseline(results, baseline, alpha=0.01, time_threshold=0.10, memory_threshold=0.10):
+    """
+    Flag cases that are significantly slower or use more memory than the baseline
+
+    A slowdown is flagged when a one-sided Mann-Whitney U test rejects "not slower"
+    at level alpha AND the median time grew by more than time_threshold, so that
+    tiny but consistent shifts do not raise alarms. With too few samples for the
+    test to ever reach alpha (e.g. 3 vs 3, where the smallest p is 0.05), the
+    median ratio alone decides.
+    """
+    comparisons = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+
+        time_ratio = current['median_time'] / previous['median_time'] - 1
+        n_current, n_previous = len(current['times']), len(previous['times'])
+        # Smallest p-value a one-sided exact test can produce for these sample counts
+        testable = (n_current and n_previous
+                    and 1 / comb(n_current + n_previous, n_current) < alpha)
+        if testable:
+            _, p_value = mannwhitneyu(current['times'], previous['times'], alternative='greater')
+            slowdown = p_value < alpha and time_ratio > time_threshold
+        else:
+            p_value = float('nan')
+            slowdown = time_ratio > time_threshold
+        memory_ratio = (current['peak_memory_bytes'] / previous['peak_memory_bytes'] - 1
+                        if previous['peak_memory_bytes'] else 0.0)
+
+        comparisons.append({
+            'benchmark': key,
+            'baseline_ms': previous['median_time'] * 1000,
+            'current_ms': current['median_time'] * 1000,
+            'time_change': time_ratio,
+            'p_value': float(p_value),
+            'test': 'mann-whitney' if testable else 'median-ratio',
+            'memory_change': memory_ratio,
+            'slowdown': bool(slowdown),
+            'memory_growth': bool(memory_ratio > memory_threshold),
+        })
+
+    return comparisons
+
+
+def print_comparison_report(comparisons):
+    """
+    Print the regression report and return the number of flagged benchmarks
+    """
+    print("="*100)
+    print("PERFORMANCE REGRESSION REPORT")
+    print("="*100)
+    print(f"{'Benchmark':<60} {'Base (ms)':<11} {'Now (ms)':<11} {'Δ time':<9} {'p':<8} {'Δ mem':<8}")
+    print("-" * 100)
+
+    flagged = 0
+    for c in comparisons:
+        marker = ''
+        if c['slowdown']:
+            marker += ' SLOWER'
+        if c['memory_growth']:
+            marker += ' MEMORY'
+        flagged += bool(marker)
+        print(f"{c['benchmark']:<60} {c['baseline_ms']:<11.3f} {c['current_ms']:<11.3f} "
+              f"{c['time_change']:<+9.1%} {c['p_value']:<8.3g} {c['memory_change']:<+8.1%}{marker}")
+
+    print("-" * 100)
+    print(f"Regressions flagged: {flagged} of {len(comparisons)}")
+    return flagged
+
+
+def main(argv=None):
+    """
+    Main benchmark suite function
+    """
+    parser = argparse.ArgumentParser(description='Sensor fusion performance regression benchmarks')
+    parser.add_argument('--lengths', type=float, nargs='+', help='signal lengths in samples')
+    parser.add_argument('--full', action='store_true', help='sweep lengths up to 1e8 samples')
+    parser.add_argument('--channels', type=int, nargs='+', default=list(DEFAULT_CHANNELS))
+    parser.add_argument('--cases', nargs='+', help='case name prefixes, e.g. fusion quality')
+    parser.add_argument('--repeats', type=int, default=7)
+    parser.add_argument('--baseline-dir', default='benchmarks/baselines')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='store results as the baseline for this machine')
+    args = parser.parse_args(argv)
+
+    if args.lengths:
+        lengths = [int(n) for n in args.lengths]
+    else:
+        lengths = FULL_LENGTHS if args.full else DEFAULT_LENGTHS
+
+    print("Starting Performance Regression Benchmarks for Automotive Sensor Fusion")
+    print("="*60)
+    print(f"Machine: {machine_id()}")
+
+    suite = BenchmarkSuite(lengths=lengths, channels=args.channels, repeats=args.repeats)
+    results = suite.run(cases=args.cases)
+
+    baseline = load_baseline(args.baseline_dir)
+    flagged = 0
+    if baseline is not None:
+        flagged = print_comparison_report(compare_to_baseline(results, baseline))
+    else:
+        print(f"\nNo baseline found for this machine in '{args.baseline_dir}'")
+
+    if args.save_baseline or baseline is None:
+        path = save_baseline(results, args.baseline_dir)
+        print(f"Baseline saved to '{path}'")
+
+    return 1 if flagged else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
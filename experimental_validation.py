@@ -19,7 +19,10 @@ from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.linear_model import LinearRegression
 import time
+import uuid
 import warnings
+from results_store import ResultsStore
+from reporting import BackgroundReporter
 warnings.filterwarnings('ignore')
 
 class SensorFusionFramework:
@@ -28,12 +31,23 @@ class SensorFusionFramework:
     with concrete performance metrics and validation for autonomous vehicles.
     """
     
-    def __init__(self, sampling_rate=100, window_size=512):
+    def __init__(self, sampling_rate=100, window_size=None, artifact_window=64, drift_window=128):
         self.sampling_rate = sampling_rate  # 100 Hz typical for automotive sensors
-        self.window_size = window_size
+        self.window_size = window_size  # most recent samples scored for quality (None = whole signal)
+        self.artifact_window = artifact_window  # rolling window for artifact scoring
+        self.drift_window = drift_window  # baseline window for drift scoring
         self.scaler = StandardScaler()
         # Weights optimized for autonomous vehicle perception stack
         self.fusion_weights = {'lidar': 0.35, 'radar': 0.30, 'camera': 0.20, 'imu': 0.10, 'gps': 0.05}
+    
+    @classmethod
+    def from_tuned_config(cls, path, tier, **kwargs):
+        """
+        Create a framework with the window configuration tuned for a deployment tier
+        (see autotune.py); keyword arguments override the tuned values
+        """
+        from autotune import load_tier_config
+        return cls(**{**load_tier_config(path, tier), **kwargs})
         
     def generate_synthetic_automotive_signals(self, duration=10, noise_level=0.1):
         """
@@ -95,12 +109,16 @@ class SensorFusionFramework:
     def compute_quality_metrics(self, signals):
         """
         Compute comprehensive quality metrics
+        Scores the most recent window_size samples of each signal
         """
         metrics = {}
         
         for name, signal in signals.items():
+            if self.window_size is not None:
+                signal = signal[-self.window_size:]
+            
             # Rolling statistics for quality assessment
-            rolling_std = pd.Series(signal).rolling(window=64).std().values
+            rolling_std = pd.Series(signal).rolling(window=self.artifact_window).std().values
             
             # SNR calculation
             noise_estimate = signal - np.mean(signal)
@@ -110,37 +128,45 @@ class SensorFusionFramework:
             artifact_score = np.clip(rolling_std / 0.2, 0, 1)
             
             # Drift score (baseline shift detection)
-            window_start = signal[:128]
-            window_end = signal[-128:]
+            window_start = signal[:self.drift_window]
+            window_end = signal[-self.drift_window:]
             drift = np.abs(np.mean(window_end) - np.mean(window_start))
             drift_score = np.clip(drift / 0.2, 0, 1)
             
             metrics[name] = {
                 'snr_db': snr_db,
-                'artifact_score': np.mean(artifact_score),
+                'artifact_score': np.nanmean(artifact_score),
                 'drift_score': drift_score,
                 'signal_power': np.mean(signal ** 2)
             }
         
         return metrics
     
-    def confidence_weighted_fusion(self, signals, quality_metrics):
+    def compute_fusion_confidence(self, quality_metrics):
         """
-        Implement confidence-weighted fusion based on quality metrics
+        Compute per-sensor fusion confidence (before normalization) from quality metrics
         """
-        weights = {}
-        for name in signals.keys():
-            snr = quality_metrics[name]['snr_db']
-            artifact = quality_metrics[name]['artifact_score']
-            drift = quality_metrics[name]['drift_score']
+        confidences = {}
+        for name, metrics in quality_metrics.items():
+            snr = metrics['snr_db']
+            artifact = metrics['artifact_score']
+            drift = metrics['drift_score']
             
             # Confidence based on SNR, low artifacts, and low drift
-            confidence = (
+            confidences[name] = (
                 0.6 * np.clip(snr / 25, 0, 1) +  # SNR contribution
                 0.25 * (1 - artifact) +           # Artifact penalty
                 0.15 * (1 - drift)                # Drift penalty
             )
-            weights[name] = confidence
+        
+        return confidences
+    
+    def confidence_weighted_fusion(self, signals, quality_metrics):
+        """
+        Implement confidence-weighted fusion based on quality metrics
+        """
+        confidences = self.compute_fusion_confidence(quality_metrics)
+        weights = {name: confidences[name] for name in signals.keys()}
         
         # Normalize weights
         total_weight = sum(weights.values())
@@ -182,9 +208,12 @@ class SensorFusionFramework:
             'correlation': np.corrcoef(true_signal, fused_signal)[0, 1]
         }
     
-    def run_experiment(self, duration=10, noise_levels=[0.05, 0.1, 0.2, 0.3]):
+    def run_experiment(self, duration=10, noise_levels=[0.05, 0.1, 0.2, 0.3], store=None,
+                       reporter=None):
         """
         Run comprehensive experiment comparing fusion methods
+        If a ResultsStore is given, metric rows are streamed to it as each run completes
+        If a BackgroundReporter is given, rows are also handed to it for incremental reporting
         """
         results = []
         
@@ -229,13 +258,23 @@ class SensorFusionFramework:
             simple_results['noise_level'] = noise_level
             
             results.extend([weighted_results, simple_results])
+            if store is not None:
+                store.extend([weighted_results, simple_results])
+            if reporter is not None:
+                reporter.submit(weighted_results)
+                reporter.submit(simple_results)
         
         return results
     
-    def visualize_results(self, results_df):
+    def visualize_results(self, results_df, show=True):
         """
         Create comprehensive visualizations of experimental results
+        Accepts a DataFrame or a ResultsStore; pass show=False for headless runs
         """
+        if isinstance(results_df, ResultsStore):
+            results_df = results_df.read_run(columns=['method', 'noise_level', 'snr_db', 'r2_score',
+                                                  'processing_time', 'correlation'])
+        
         fig, axes = plt.subplots(2, 2, figsize=(15, 12))
         
         # SNR comparison
@@ -264,12 +303,20 @@ class SensorFusionFramework:
         
         plt.tight_layout()
         plt.savefig('experimental_results.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        if show:
+            plt.show()
+        else:
+            plt.close(fig)
     
     def generate_performance_report(self, results_df):
         """
         Generate detailed performance report
+        Accepts a DataFrame or a ResultsStore
         """
+        if isinstance(results_df, ResultsStore):
+            results_df = results_df.read_run(columns=['method', 'noise_level', 'snr_db', 'r2_score',
+                                                  'correlation', 'processing_time'])
+        
         print("="*60)
         print("EXPERIMENTAL VALIDATION REPORT")
         print("="*60)
@@ -334,21 +381,27 @@ def main():
     # Initialize framework
     framework = SensorFusionFramework()
     
-    # Run comprehensive experiment
-    results = framework.run_experiment(duration=10, noise_levels=[0.05, 0.1, 0.2, 0.3])
-    
-    # Convert to DataFrame for analysis
-    results_df = pd.DataFrame(results)
-    
-    # Generate visualizations
-    framework.visualize_results(results_df)
-    
-    # Generate performance report
-    framework.generate_performance_report(results_df)
+    # Run comprehensive experiment, streaming rows to the results store
+    # and rendering visualizations in the background as runs complete
+    run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    with BackgroundReporter('experimental_results.png') as reporter, \
+            ResultsStore('experimental_results', run_id=run_id) as store:
+        framework.run_experiment(duration=10, noise_levels=[0.05, 0.1, 0.2, 0.3],
+                                 store=store, reporter=reporter)
+        
+        # The final figure is finished by the renderer process without blocking the report
+        reporter.close(wait=False)
+        
+        # Read back for analysis
+        results_df = store.read_run()
+        
+        # Generate performance report
+        framework.generate_performance_report(results_df)
+        
+        # Surface any failure in the final render
+        reporter.join()
     
-    # Save results
-    results_df.to_csv('experimental_results.csv', index=False)
-    print(f"\nResults saved to 'experimental_results.csv'")
+    print(f"\nResults saved to 'experimental_results/' (run_id={run_id})")
     
     return results_df
 
@@ -0,0 +1,577 @@
+#!/usr/bin/env python3
+"""
+Multi-Vehicle Fleet Fusion Service for Automotive Sensor Fusion Framework
+Per-vehicle streaming fusion state sharded across worker processes
+
+This module provides:
+1. Consistent-hash routing of vehicle IDs to worker processes
+2. Shared-memory ring buffers for sample handoff (one producer, one consumer, locked index updates)
+3. Streaming confidence-weighted fusion state kept per vehicle inside each worker
+4. Fused outputs returned per vehicle through per-worker result rings (polled or via callback)
+5. Aggregate throughput and per-vehicle latency percentiles as fleet size grows
+"""
+
+import bisect
+import queue
+import hashlib
+import time
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+
+SENSOR_NAMES = ('lidar', 'radar', 'camera', 'imu', 'gps')
+
+# Ring buffer header slots
+HEAD, TAIL, CLOSED = 0, 1, 2
+# Leading columns of each ring buffer row, followed by the sensor channels
+VEHICLE_COL, TIMESTAMP_COL, N_META_COLS = 0, 1, 2
+# Result ring rows: vehicle index, submit timestamp, fused value
+FUSED_COL, OUTPUT_WIDTH = 2, 3
+
+
+class ConsistentHashRing:
+    """
+    Consistent hashing of vehicle IDs onto workers using virtual nodes
+    """
+
+    def __init__(self, nodes, replicas=64):
+        self.replicas = replicas
+        self._keys = []
+        self._nodes = {}
+        for node in nodes:
+            self.add_node(node)
+
+    @staticmethod
+    def _hash(key):
+        return int.from_bytes(hashlib.md5(str(key).encode()).digest()[:8], 'big')
+
+    def add_node(self, node):
+        for i in range(self.replicas):
+            h = self._hash(f"{node}#{i}")
+            bisect.insort(self._keys, h)
+            self._nodes[h] = node
+
+    def remove_node(self, node):
+        for i in range(self.replicas):
+            h = self._hash(f"{node}#{i}")
+            self._keys.remove(h)
+            del self._nodes[h]
+
+    def get_node(self, key):
+        idx = bisect.bisect(self._keys, self._hash(key)) % len(self._keys)
+        return self._nodes[self._keys[idx]]
+
+
+class SharedRingBuffer:
+    """
+    Single-producer single-consumer ring buffer of float64 rows in shared memory
+
+    Rows are copied without locking, but HEAD/TAIL/CLOSED are only read and published
+    while holding a multiprocessing lock. Acquiring and releasing it acts as a memory
+    barrier, so on weakly ordered CPUs (e.g. ARM) the consumer never sees an index
+    update before the rows it covers. Attach from another process with the owner's
+    name and lock.
+    """
+
+    def __init__(self, capacity, width, name=None, lock=None):
+        self.capacity = capacity
+        self.width = width
+        self.lock = lock if lock is not None else mp.Lock()
+        nbytes = 3 * 8 + capacity * width * 8
+        self._owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self._owner, size=nbytes)
+        self.header = np.ndarray((3,), dtype=np.int64, buffer=self.shm.buf)
+        self.data = np.ndarray((capacity, width), dtype=np.float64, buffer=self.shm.buf, offset=24)
+        if self._owner:
+            self.header[:] = 0
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def closed(self):
+        with self.lock:
+            return bool(self.header[CLOSED])
+
+    def __len__(self):
+        with self.lock:
+            return int(self.header[HEAD] - self.header[TAIL])
+
+    def close_writer(self):
+        with self.lock:
+            self.header[CLOSED] = 1
+
+    def write(self, rows, on_wait=None):
+        """
+        Copy rows into the buffer, waiting for space when the consumer falls behind
+        on_wait is called while waiting, e.g. to drain the consumer's own output
+        """
+        written = 0
+        while written < len(rows):
+            with self.lock:
+                head, tail = int(self.header[HEAD]), int(self.header[TAIL])
+            free = self.capacity - (head - tail)
+            if free == 0:
+                if on_wait is not None:
+                    on_wait()
+                time.sleep(0)
+                continue
+
+            n = min(free, len(rows) - written)
+            start = head % self.capacity
+            first = min(n, self.capacity - start)
+            self.data[start:start + first] = rows[written:written + first]
+            self.data[:n - first] = rows[written + first:written + n]
+            # Publish only after the rows are in place
+            with self.lock:
+                self.header[HEAD] = head + n
+            written += n
+
+    def read(self, max_rows=None):
+        """
+        Return a copy of all currently available rows (possibly empty)
+        """
+        with self.lock:
+            head, tail = int(self.header[HEAD]), int(self.header[TAIL])
+        n = head - tail
+        if max_rows is not None:
+            n = min(n, max_rows)
+        if n == 0:
+            return self.data[:0].copy()
+
+        start = tail % self.capacity
+        first = min(n, self.capacity - start)
+        rows = np.concatenate([self.data[start:start + first], self.data[:n - first]])
+        with self.lock:
+            self.header[TAIL] = tail + n
+        return rows
+
+    def release(self):
+        """
+        Detach from the shared block, unlinking it if this instance created it
+        """
+        del self.header, self.data
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+
+class StreamingFusionState:
+    """
+    Per-vehicle streaming confidence-weighted fusion over a sliding window
+    """
+
+    def __init__(self, n_channels, window_size=512, artifact_window=64, drift_window=128,
+                 update_every=64):
+        self.window_size = window_size
+        self.artifact_window = artifact_window
+        self.drift_window = drift_window
+        self.update_every = update_every  # samples between confidence weight refreshes
+        self.window = np.zeros((window_size, n_channels))
+        self.count = 0
+        self.since_update = 0
+        self.baseline = None  # per-channel mean of the first drift window
+        self.weights = np.full(n_channels, 1.0 / n_channels)
+        self.last_fused = 0.0
+
+    def process(self, samples):
+        """
+        Push a block of samples (rows x channels) and return their fused values
+        """
+        fused = np.empty(len(samples))
+        pos = 0
+        while pos < len(samples):
+            n = min(len(samples) - pos, self.update_every - self.since_update)
+            block = samples[pos:pos + n]
+            self._push(block)
+            fused[pos:pos + n] = block @ self.weights
+            pos += n
+            self.since_update += n
+            if self.since_update >= self.update_every:
+                self._update_weights()
+                self.since_update = 0
+
+        if len(fused):
+            self.last_fused = fused[-1]
+        return fused
+
+    def _push(self, block):
+        n = min(len(block), self.window_size)
+        self.window = np.roll(self.window, -n, axis=0)
+        self.window[-n:] = block[-n:]
+        self.count += len(block)
+        if self.baseline is None and self.count >= self.drift_window:
+            self.baseline = self.window[-self.count:][:self.drift_window].mean(axis=0)
+
+    def _update_weights(self):
+        """
+        Same confidence formula as SensorFusionFramework.confidence_weighted_fusion
+        """
+        window = self.window[-min(self.count, self.window_size):]
+        if len(window) < 2:
+            return
+
+        signal_power = np.mean(window ** 2, axis=0)
+        noise_power = np.maximum(1e-9, np.var(window, axis=0))
+        snr_db = 10 * np.log10(np.maximum(signal_power, 1e-12) / noise_power)
+
+        recent = window[-self.artifact_window:]
+        artifact = np.clip(np.std(recent, axis=0, ddof=1) / 0.2, 0, 1) if len(recent) > 1 else 0.0
+
+        if self.baseline is not None:
+            drift = np.abs(window[-self.drift_window:].mean(axis=0) - self.baseline)
+            drift = np.clip(drift / 0.2, 0, 1)
+        else:
+            drift = 0.0
+
+        confidence = (
+            0.6 * np.clip(snr_db / 25, 0, 1) +
+            0.25 * (1 - artifact) +
+            0.15 * (1 - drift)
+        )
+        total = confidence.sum()
+        if total > 0:
+            self.weights = confidence / total
+
+
+def _fleet_worker(ring_name, ring_lock, output_name, output_lock, capacity, width, result_queue,
+                  state_kwargs):
+    """
+    Worker process loop: drain the ring buffer, fuse samples per vehicle and publish them
+    """
+    ring = SharedRingBuffer(capacity, width, name=ring_name, lock=ring_lock)
+    output = SharedRingBuffer(capacity, OUTPUT_WIDTH, name=output_name, lock=output_lock)
+    states = {}
+    latencies = {}
+    fused_counts = {}
+
+    while True:
+        rows = ring.read()
+        if len(rows) == 0:
+            if ring.closed and len(ring) == 0:
+                break
+            time.sleep(0.0005)
+            continue
+
+        vehicle_ids = rows[:, VEHICLE_COL].astype(np.int64)
+        for vehicle in np.unique(vehicle_ids):
+            mask = vehicle_ids == vehicle
+            state = states.get(vehicle)
+            if state is None:
+                state = states[vehicle] = StreamingFusionState(width - N_META_COLS, **state_kwargs)
+                latencies[vehicle] = []
+                fused_counts[vehicle] = 0
+
+            fused = state.process(rows[mask, N_META_COLS:])
+            done = time.perf_counter()
+            latencies[vehicle].append(done - rows[mask, TIMESTAMP_COL])
+            fused_counts[vehicle] += int(mask.sum())
+            output.write(np.column_stack([rows[mask, VEHICLE_COL], rows[mask, TIMESTAMP_COL], fused]))
+
+    result_queue.put({
+        int(v): {
+            'latencies': np.concatenate(latencies[v]),
+            'samples': fused_counts[v],
+            'weights': states[v].weights,
+        }
+        for v in states
+    })
+    ring.release()
+    output.release()
+
+
+class FleetFusionService:
+    """
+    Fleet-mode fusion: routes vehicle sample streams to sharded worker processes
+
+    Fused values come back through per-worker result rings. Without a callback they are
+    buffered per vehicle and collected with fetch(); with callback(vehicle_id, fused,
+    submit_timestamps) they are delivered as soon as poll() (also called by submit/stop) sees them.
+    """
+
+    def __init__(self, n_workers=None, n_channels=len(SENSOR_NAMES), ring_capacity=1 << 16,
+                 window_size=512, artifact_window=64, drift_window=128, update_every=64,
+                 callback=None, stop_timeout=60.0):
+        self.n_workers = n_workers or mp.cpu_count()
+        self.n_channels = n_channels
+        self.ring_capacity = ring_capacity
+        self.width = n_channels + N_META_COLS
+        self.state_kwargs = {'window_size': window_size, 'artifact_window': artifact_window,
+                             'drift_window': drift_window, 'update_every': update_every}
+        self.ring = ConsistentHashRing(range(self.n_workers))
+        self._vehicle_index = {}
+        self._route = {}
+        self.callback = callback
+        self.stop_timeout = stop_timeout  # seconds to wait for workers to drain on stop()
+        self._rings = []
+        self._output_rings = []
+        self._outputs = {}
+        self._workers = []
+        self._results = None
+        self._start_time = None
+
+    @classmethod
+    def from_tuned_config(cls, path, tier, **kwargs):
+        """
+        Create a fleet service with the window configuration tuned for a deployment tier
+        (see autotune.py). Streaming state needs a finite window, so a tuned window_size of
+        None (whole signal) keeps the service default.
+        """
+        from autotune import load_tier_config
+        config = load_tier_config(path, tier)
+        if config.get('window_size') is None:
+            config.pop('window_size', None)
+        return cls(**{**config, **kwargs})
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def start(self):
+        """
+        Allocate the shared-memory rings and launch the worker processes
+        """
+        self._results = mp.Queue()
+        for _ in range(self.n_workers):
+            ring = SharedRingBuffer(self.ring_capacity, self.width)
+            output = SharedRingBuffer(self.ring_capacity, OUTPUT_WIDTH)
+            worker = mp.Process(target=_fleet_worker, daemon=True,
+                                args=(ring.name, ring.lock, output.name, output.lock,
+                                      self.ring_capacity, self.width, self._results,
+                                      self.state_kwargs))
+            worker.start()
+            self._rings.append(ring)
+            self._output_rings.append(output)
+            self._workers.append(worker)
+        self._start_time = time.perf_counter()
+
+    def worker_for(self, vehicle_id):
+        """
+        Worker index owning a vehicle, cached after the first lookup
+        """
+        worker = self._route.get(vehicle_id)
+        if worker is None:
+            worker = self._route[vehicle_id] = self.ring.get_node(vehicle_id)
+            self._vehicle_index[vehicle_id] = len(self._vehicle_index)
+        return worker
+
+    def submit(self, vehicle_id, samples):
+        """
+        Hand off one sample (channels,) or a block of samples (rows, channels) for a vehicle
+        """
+        samples = np.atleast_2d(np.asarray(samples, dtype=np.float64))
+        worker = self.worker_for(vehicle_id)
+
+        rows = np.empty((len(samples), self.width))
+        rows[:, VEHICLE_COL] = self._vehicle_index[vehicle_id]
+        rows[:, N_META_COLS:] = samples
+        rows[:, TIMESTAMP_COL] = time.perf_counter()
+        # Drain results while waiting so a worker blocked on its result ring can make progress
+        def on_wait():
+            self._check_worker(worker)
+            self.poll()
+
+        self._rings[worker].write(rows, on_wait=on_wait)
+
+    def _check_worker(self, index):
+        """
+        Raise (after shutting the fleet down) if a worker process has died
+        """
+        worker = self._workers[index]
+        if not worker.is_alive():
+            self._shutdown()
+            raise RuntimeError(f"Fleet worker {index} died with exit code {worker.exitcode}")
+
+    def poll(self):
+        """
+        Collect fused values from the result rings, returning the number of samples received
+        """
+        names = None
+        received = 0
+        for output in self._output_rings:
+            rows = output.read()
+            if len(rows) == 0:
+                continue
+            if names is None:
+                names = {index: vehicle for vehicle, index in self._vehicle_index.items()}
+
+            received += len(rows)
+            vehicle_ids = rows[:, VEHICLE_COL].astype(np.int64)
+            for index in np.unique(vehicle_ids):
+                mask = vehicle_ids == index
+                vehicle = names[int(index)]
+                if self.callback is not None:
+                    self.callback(vehicle, rows[mask, FUSED_COL], rows[mask, TIMESTAMP_COL])
+                else:
+                    self._outputs.setdefault(vehicle, []).append(rows[mask, FUSED_COL])
+        return received
+
+    def fetch(self, vehicle_id=None):
+        """
+        Return and clear buffered fused values for one vehicle, or a dict for all vehicles
+        """
+        self.poll()
+        if vehicle_id is not None:
+            chunks = self._outputs.pop(vehicle_id, [])
+            return np.concatenate(chunks) if chunks else np.zeros(0)
+
+        outputs = {vehicle: np.concatenate(chunks) for vehicle, chunks in self._outputs.items()}
+        self._outputs = {}
+        return outputs
+
+    def stop(self):
+        """
+        Drain the workers, shut them down and return the fleet performance summary
+        Raises RuntimeError if a worker crashed and TimeoutError if draining takes too long
+        """
+        if not self._workers:
+            return None
+
+        for ring in self._rings:
+            ring.close_writer()
+        deadline = time.monotonic() + self.stop_timeout
+        worker_results = []
+        while len(worker_results) < len(self._workers):
+            self.poll()
+            try:
+                worker_results.append(self._results.get(timeout=0.01))
+                continue
+            except queue.Empty:
+                pass
+
+            # A worker that exited cleanly has already queued its result
+            for index, worker in enumerate(self._workers):
+                if worker.exitcode not in (None, 0):
+                    self._check_worker(index)
+            if time.monotonic() > deadline:
+                self._shutdown()
+                raise TimeoutError(f"Fleet workers did not drain within {self.stop_timeout} s")
+
+        wall_time = time.perf_counter() - self._start_time
+        for worker in self._workers:
+            worker.join()
+        self.poll()
+        self._shutdown()
+
+        names = {index: vehicle for vehicle, index in self._vehicle_index.items()}
+        per_vehicle = {}
+        for result in worker_results:
+            for index, stats in result.items():
+                per_vehicle[names[index]] = stats
+        return self._summarize(per_vehicle, wall_time)
+
+    def _shutdown(self):
+        """
+        Stop any remaining workers and release the shared-memory rings
+        """
+        for worker in self._workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
+        for ring in self._rings + self._output_rings:
+            ring.release()
+        self._rings, self._output_rings, self._workers = [], [], []
+
+    def _summarize(self, per_vehicle, wall_time):
+        total_samples = sum(stats['samples'] for stats in per_vehicle.values())
+        all_latencies = (np.concatenate([stats['latencies'] for stats in per_vehicle.values()])
+                         if per_vehicle else np.zeros(0))
+
+        vehicle_rows = []
+        for vehicle, stats in per_vehicle.items():
+            p50, p95, p99 = np.percentile(stats['latencies'], [50, 95, 99]) * 1000
+            vehicle_rows.append({'vehicle_id': vehicle, 'worker': self._route[vehicle],
+                                 'samples': stats['samples'], 'p50_ms': p50,
+                                 'p95_ms': p95, 'p99_ms': p99})
+
+        summary = {
+            'n_workers': self.n_workers,
+            'n_vehicles': len(per_vehicle),
+            'total_samples': total_samples,
+            'wall_time': wall_time,
+            'throughput_samples_per_s': total_samples / wall_time if wall_time > 0 else 0.0,
+            'per_vehicle': pd.DataFrame(vehicle_rows),
+        }
+        if len(all_latencies):
+            p50, p95, p99 = np.percentile(all_latencies, [50, 95, 99]) * 1000
+            summary.update({'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99})
+        return summary
+
+
+def benchmark_fleet(fleet_sizes=(1, 4, 16, 64), n_workers=None, duration=10, sampling_rate=100,
+                    block_size=10):
+    """
+    Measure aggregate throughput and latency percentiles as the fleet grows
+    Fleet-wide percentiles pool every sample; the vehicle_* columns give the spread across
+    vehicles (median and max of each vehicle's own p50/p99), exposing vehicles that lag behind
+    """
+    from experimental_validation import SensorFusionFramework
+
+    framework = SensorFusionFramework(sampling_rate=sampling_rate)
+    rows = []
+
+    for fleet_size in fleet_sizes:
+        print(f"Running fleet benchmark with {fleet_size} vehicles")
+        streams = {}
+        for v in range(fleet_size):
+            _, *channels = framework.generate_synthetic_automotive_signals(duration, noise_level=0.1)
+            streams[f"vehicle_{v:04d}"] = np.column_stack(channels)
+
+        with FleetFusionService(n_workers=n_workers) as service:
+            n_samples = len(next(iter(streams.values())))
+            # Interleave vehicles block by block, as samples would arrive in deployment
+            for start in range(0, n_samples, block_size):
+                for vehicle_id, stream in streams.items():
+                    service.submit(vehicle_id, stream[start:start + block_size])
+            summary = service.stop()
+
+        per_vehicle = summary['per_vehicle']
+        rows.append({
+            'fleet_size': fleet_size,
+            'n_workers': summary['n_workers'],
+            'throughput_samples_per_s': summary['throughput_samples_per_s'],
+            'p50_ms': summary['p50_ms'],
+            'p95_ms': summary['p95_ms'],
+            'p99_ms': summary['p99_ms'],
+            'vehicle_p50_median_ms': per_vehicle['p50_ms'].median(),
+            'vehicle_p50_max_ms': per_vehicle['p50_ms'].max(),
+            'vehicle_p99_median_ms': per_vehicle['p99_ms'].median(),
+            'vehicle_p99_max_ms': per_vehicle['p99_ms'].max(),
+        })
+
+    return pd.DataFrame(rows)
+
+
+def main():
+    """
+    Main fleet fusion benchmark function
+    """
+    print("Starting Fleet Fusion Benchmark for Automotive Sensor Fusion")
+    print("="*60)
+    print("Target Application: Autonomous and Connected Vehicle Fleets")
+
+    results_df = benchmark_fleet()
+
+    print("\nFLEET SCALING REPORT:")
+    print("-" * 100)
+    print(f"{'':<10} {'':<8} {'':<14} {'Fleet-wide (ms)':<30} {'Per-vehicle median/max (ms)'}")
+    print(f"{'Vehicles':<10} {'Workers':<8} {'Samples/s':<14} {'p50':<10} {'p95':<10} {'p99':<10} "
+          f"{'p50':<18} {'p99'}")
+    print("-" * 100)
+    for _, row in results_df.iterrows():
+        vehicle_p50 = f"{row['vehicle_p50_median_ms']:.3f}/{row['vehicle_p50_max_ms']:.3f}"
+        vehicle_p99 = f"{row['vehicle_p99_median_ms']:.3f}/{row['vehicle_p99_max_ms']:.3f}"
+        print(f"{int(row['fleet_size']):<10} {int(row['n_workers']):<8} "
+              f"{row['throughput_samples_per_s']:<14.0f} "
+              f"{row['p50_ms']:<10.3f} {row['p95_ms']:<10.3f} {row['p99_ms']:<10.3f} "
+              f"{vehicle_p50:<18} {vehicle_p99}")
+
+    return results_df
+
+if __name__ == "__main__":
+    results = main()
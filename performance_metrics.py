@@ -16,10 +16,13 @@ import pandas as pd
 import time
 import psutil
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from scipy import signal
 from scipy.stats import pearsonr
 from sklearn.metrics import mean_squared_error, r2_score
 import warnings
+from reporting import BackgroundReporter
 warnings.filterwarnings('ignore')
 
 class PerformanceMetrics:
@@ -27,10 +30,21 @@ class PerformanceMetrics:
     Comprehensive performance metrics for sensor fusion framework
     """
     
-    def __init__(self, sampling_rate=100, window_size=512):
+    def __init__(self, sampling_rate=100, window_size=None, artifact_window=64, drift_window=128):
         self.sampling_rate = sampling_rate  # 100 Hz typical for automotive sensors
-        self.window_size = window_size
+        self.window_size = window_size  # most recent samples scored for quality (None = whole signal)
+        self.artifact_window = artifact_window  # rolling window for artifact scoring
+        self.drift_window = drift_window  # baseline window for drift scoring
         self.metrics_history = []
+    
+    @classmethod
+    def from_tuned_config(cls, path, tier, **kwargs):
+        """
+        Create metrics with the window configuration tuned for a deployment tier
+        (see autotune.py); keyword arguments override the tuned values
+        """
+        from autotune import load_tier_config
+        return cls(**{**load_tier_config(path, tier), **kwargs})
         
     def compute_snr_db(self, signal, noise_estimate):
         """
@@ -43,11 +57,13 @@ class PerformanceMetrics:
         snr_db = 10 * np.log10(signal_power / noise_power)
         return snr_db
     
-    def compute_artifact_score(self, signal, window_size=64):
+    def compute_artifact_score(self, signal, window_size=None):
         """
         Compute artifact score based on signal variability
         Using rolling statistics for real-time assessment
         """
+        window_size = window_size or self.artifact_window
+        
         # Convert to pandas Series for rolling operations
         signal_series = pd.Series(signal)
         
@@ -59,33 +75,30 @@ class PerformanceMetrics:
         
         return artifact_score.fillna(0).values
     
-    def compute_drift_score(self, signal, window_size=128):
+    def compute_drift_score(self, signal, window_size=None):
         """
         Compute baseline drift score
+        Rolling window means come from a cumulative sum, so the cost is O(n) for any window size
         """
+        window_size = window_size or self.drift_window
         if len(signal) < 2 * window_size:
             return np.zeros_like(signal)
         
         # Baseline comparison
-        window_start = signal[:window_size]
-        window_end = signal[-window_size:]
-        
-        # Rolling drift calculation
-        drift_scores = []
-        for i in range(len(signal)):
-            start_idx = max(0, i - window_size)
-            end_idx = min(len(signal), i + window_size)
-            
-            if end_idx - start_idx < window_size:
-                drift_scores.append(0)
-                continue
-                
-            current_window = signal[start_idx:end_idx]
-            drift = np.abs(np.mean(current_window) - np.mean(window_start))
-            drift_score = np.clip(drift / 0.2, 0, 1)
-            drift_scores.append(drift_score)
-        
-        return np.array(drift_scores)
+        baseline = np.mean(signal[:window_size])
+        
+        # Rolling drift calculation over [i - window_size, i + window_size)
+        n = len(signal)
+        idx = np.arange(n)
+        start_idx = np.maximum(0, idx - window_size)
+        end_idx = np.minimum(n, idx + window_size)
+        cumsum = np.concatenate(([0.0], np.cumsum(signal, dtype=np.float64)))
+        window_mean = (cumsum[end_idx] - cumsum[start_idx]) / (end_idx - start_idx)
+        
+        drift_scores = np.clip(np.abs(window_mean - baseline) / 0.2, 0, 1)
+        drift_scores[end_idx - start_idx < window_size] = 0
+        
+        return drift_scores
     
     def compute_fusion_confidence(self, quality_metrics):
         """
@@ -143,10 +156,14 @@ class PerformanceMetrics:
     def comprehensive_quality_assessment(self, signals):
         """
         Perform comprehensive quality assessment on all signals
+        Scores the most recent window_size samples of each signal
         """
         quality_results = {}
         
         for name, signal in signals.items():
+            if self.window_size is not None:
+                signal = signal[-self.window_size:]
+            
             # Basic quality metrics
             snr_db = self.compute_snr_db(signal, signal - np.mean(signal))
             artifact_score = np.mean(self.compute_artifact_score(signal))
@@ -182,9 +199,12 @@ class PerformanceMetrics:
         else:
             return 'Poor'
     
-    def benchmark_fusion_methods(self, signals, ground_truth):
+    def benchmark_fusion_methods(self, signals, ground_truth, store=None, reporter=None):
         """
         Benchmark different fusion methods
+        If a ResultsStore is given, metric rows are streamed to it and fused signals
+        are written to memory-mapped blocks instead of being kept in the results
+        If a BackgroundReporter is given, metric rows are handed to it as each method finishes
         """
         methods = {
             'confidence_weighted': self._confidence_weighted_fusion,
@@ -214,6 +234,17 @@ class PerformanceMetrics:
                 'snr_db': snr,
                 'fused_signal': fused_signal
             }
+            
+            if store is not None:
+                signal_key = f"{method_name}_{len(store)}"
+                store.save_signal(signal_key, fused_signal)
+                store.append({'method': method_name, 'signal_key': signal_key,
+                              **{k: v for k, v in results[method_name].items() if k != 'fused_signal'}})
+                results[method_name]['fused_signal'] = signal_key
+            
+            if reporter is not None:
+                reporter.submit({'method': method_name,
+                                 **{k: v for k, v in results[method_name].items() if k != 'fused_signal'}})
         
         return results
     
@@ -306,49 +337,77 @@ class PerformanceMetrics:
         
         return benchmark_results
     
-    def create_performance_visualizations(self, benchmark_results):
+    def create_performance_visualizations(self, benchmark_results, show=True):
         """
         Create comprehensive performance visualizations
+        Pass show=False for headless runs
         """
         fig, axes = plt.subplots(2, 2, figsize=(15, 12))
         
         methods = list(benchmark_results.keys())
-        snr_values = [benchmark_results[m]['snr_db'] for m in methods]
-        r2_values = [benchmark_results[m]['r2_score'] for m in methods]
-        correlation_values = [benchmark_results[m]['correlation'] for m in methods]
-        time_values = [benchmark_results[m]['processing_time']*1000 for m in methods]
-        
-        # SNR comparison
-        axes[0,0].bar(methods, snr_values, color=['#1f77b4', '#ff7f0e', '#2ca02c'])
-        axes[0,0].set_title('SNR Comparison by Fusion Method')
-        axes[0,0].set_ylabel('SNR (dB)')
-        axes[0,0].tick_params(axis='x', rotation=45)
-        
-        # R² Score comparison
-        axes[0,1].bar(methods, r2_values, color=['#1f77b4', '#ff7f0e', '#2ca02c'])
-        axes[0,1].set_title('R² Score Comparison by Fusion Method')
-        axes[0,1].set_ylabel('R² Score')
-        axes[0,1].tick_params(axis='x', rotation=45)
-        
-        # Correlation comparison
-        axes[1,0].bar(methods, correlation_values, color=['#1f77b4', '#ff7f0e', '#2ca02c'])
-        axes[1,0].set_title('Correlation with Ground Truth')
-        axes[1,0].set_ylabel('Correlation Coefficient')
-        axes[1,0].tick_params(axis='x', rotation=45)
-        
-        # Processing time comparison
-        axes[1,1].bar(methods, time_values, color=['#1f77b4', '#ff7f0e', '#2ca02c'])
-        axes[1,1].set_title('Processing Time Comparison')
-        axes[1,1].set_ylabel('Time (ms)')
-        axes[1,1].tick_params(axis='x', rotation=45)
-        
-        # Add target latency line
-        axes[1,1].axhline(y=5, color='red', linestyle='--', label='Target (5ms)')
-        axes[1,1].legend()
+        draw_performance_metrics(axes, methods,
+                                 [benchmark_results[m]['snr_db'] for m in methods],
+                                 [benchmark_results[m]['r2_score'] for m in methods],
+                                 [benchmark_results[m]['correlation'] for m in methods],
+                                 [benchmark_results[m]['processing_time']*1000 for m in methods])
         
         plt.tight_layout()
         plt.savefig('performance_metrics.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        if show:
+            plt.show()
+        else:
+            plt.close(fig)
+
+def draw_performance_metrics(axes, methods, snr_values, r2_values, correlation_values, time_values):
+    """
+    Draw the SNR, R², correlation and processing time (ms) panels onto a 2x2 grid of axes
+    """
+    # SNR comparison
+    axes[0,0].bar(methods, snr_values, color=['#1f77b4', '#ff7f0e', '#2ca02c'])
+    axes[0,0].set_title('SNR Comparison by Fusion Method')
+    axes[0,0].set_ylabel('SNR (dB)')
+    axes[0,0].tick_params(axis='x', rotation=45)
+    
+    # R² Score comparison
+    axes[0,1].bar(methods, r2_values, color=['#1f77b4', '#ff7f0e', '#2ca02c'])
+    axes[0,1].set_title('R² Score Comparison by Fusion Method')
+    axes[0,1].set_ylabel('R² Score')
+    axes[0,1].tick_params(axis='x', rotation=45)
+    
+    # Correlation comparison
+    axes[1,0].bar(methods, correlation_values, color=['#1f77b4', '#ff7f0e', '#2ca02c'])
+    axes[1,0].set_title('Correlation with Ground Truth')
+    axes[1,0].set_ylabel('Correlation Coefficient')
+    axes[1,0].tick_params(axis='x', rotation=45)
+    
+    # Processing time comparison
+    axes[1,1].bar(methods, time_values, color=['#1f77b4', '#ff7f0e', '#2ca02c'])
+    axes[1,1].set_title('Processing Time Comparison')
+    axes[1,1].set_ylabel('Time (ms)')
+    axes[1,1].tick_params(axis='x', rotation=45)
+    
+    # Add target latency line
+    axes[1,1].axhline(y=5, color='red', linestyle='--', label='Target (5ms)')
+    axes[1,1].legend()
+
+def render_performance_metrics(summary, group_by, metrics, output_path, dpi=300):
+    """
+    Render the performance figure from BackgroundReporter statistics using the headless Agg canvas
+    Runs in the reporter's renderer process, off the benchmark's critical path
+    """
+    if summary.empty:
+        return
+    
+    fig = Figure(figsize=(15, 12))
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(2, 2)
+    
+    methods = [str(m) for m in summary.index]
+    draw_performance_metrics(axes, methods, summary['snr_db'].values, summary['r2_score'].values,
+                             summary['correlation'].values, summary['processing_time'].values * 1000)
+    
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=dpi, bbox_inches='tight')
 
 def main():
     """
@@ -388,14 +447,19 @@ def main():
     ground_truth = (0.35 * lidar + 0.30 * radar + 0.20 * camera + 
                    0.10 * imu + 0.05 * gps)
     
-    # Run benchmark
-    benchmark_results = metrics.benchmark_fusion_methods(signals, ground_truth)
-    
-    # Generate report
-    metrics.generate_performance_report(benchmark_results)
-    
-    # Create visualizations
-    metrics.create_performance_visualizations(benchmark_results)
+    # Run benchmark, rendering visualizations in the background
+    with BackgroundReporter('performance_metrics.png', group_by=('method',),
+                            render=render_performance_metrics) as reporter:
+        benchmark_results = metrics.benchmark_fusion_methods(signals, ground_truth, reporter=reporter)
+        
+        # The final figure is finished by the renderer process without blocking the report
+        reporter.close(wait=False)
+        
+        # Generate report
+        metrics.generate_performance_report(benchmark_results)
+        
+        # Surface any failure in the final render
+        reporter.join()
     
     return benchmark_results
 
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Incremental Background Reporting for Automotive Sensor Fusion Experiments
+Non-blocking aggregation and plotting for long-running experiment sweeps
+
+This module provides:
+1. Incremental groupby statistics (count, mean, std) updated as runs finish
+2. A background consumer thread fed through a queue, off the experiment's critical path
+3. Headless figure rendering via the Agg canvas in a separate process (no pyplot, no GIL contention)
+"""
+
+import time
+import pickle
+import queue
+import threading
+import multiprocessing as mp
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+DEFAULT_METRICS = ('snr_db', 'r2_score', 'processing_time', 'correlation')
+METRIC_LABELS = {
+    'snr_db': ('SNR Comparison by Method', 'SNR (dB)'),
+    'r2_score': ('R² Score Comparison', 'R² Score'),
+    'processing_time': ('Processing Time Comparison', 'Time (seconds)'),
+    'correlation': ('Correlation with Ground Truth', 'Correlation Coefficient'),
+    'mse': ('MSE Comparison', 'MSE'),
+}
+
+
+class IncrementalAggregator:
+    """
+    Running groupby statistics using Welford's online algorithm
+    """
+
+    def __init__(self, group_by=('method', 'noise_level'), metrics=DEFAULT_METRICS):
+        self.group_by = tuple(group_by)
+        self.metrics = tuple(metrics)
+        self.groups = {}  # group key -> {metric: [count, mean, M2]}
+
+    def update(self, row):
+        """
+        Fold a single result row into the running statistics
+        """
+        key = tuple(row.get(column) for column in self.group_by)
+        stats = self.groups.setdefault(key, {m: [0, 0.0, 0.0] for m in self.metrics})
+
+        for metric in self.metrics:
+            value = row.get(metric)
+            if value is None or not np.isfinite(value):
+                continue
+            entry = stats[metric]
+            entry[0] += 1
+            delta = value - entry[1]
+            entry[1] += delta / entry[0]
+            entry[2] += delta * (value - entry[1])
+
+    def to_frame(self):
+        """
+        Current statistics as a DataFrame indexed by the group columns
+        """
+        records = []
+        for key, stats in self.groups.items():
+            record = dict(zip(self.group_by, key))
+            for metric, (count, mean, m2) in stats.items():
+                record[metric] = mean if count else np.nan
+                record[f"{metric}_std"] = np.sqrt(m2 / (count - 1)) if count > 1 else 0.0
+                record[f"{metric}_count"] = count
+            records.append(record)
+
+        if not records:
+            return pd.DataFrame(columns=list(self.group_by))
+        return pd.DataFrame(records).set_index(list(self.group_by)).sort_index()
+
+
+def render_summary(summary, group_by, metrics, output_path, dpi=300):
+    """
+    Render aggregated statistics to a PNG using the headless Agg canvas
+    """
+    if summary.empty:
+        return
+
+    n_cols = 2 if len(metrics) > 1 else 1
+    n_rows = int(np.ceil(len(metrics) / n_cols))
+    fig = Figure(figsize=(7.5 * n_cols, 6 * n_rows))
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(n_rows, n_cols, squeeze=False).flatten()
+
+    for ax, metric in zip(axes, metrics):
+        title, ylabel = METRIC_LABELS.get(metric, (metric, metric))
+        values = summary[metric]
+
+        if isinstance(values.index, pd.MultiIndex):
+            # Grouped bars: first level on the x-axis, remaining levels as series
+            table = values.unstack(list(range(1, values.index.nlevels)))
+            width = 0.8 / max(len(table.columns), 1)
+            x = np.arange(len(table.index))
+            for i, column in enumerate(table.columns):
+                ax.bar(x + i * width, table[column].values, width, label=str(column))
+            ax.set_xticks(x + width * (len(table.columns) - 1) / 2)
+            ax.set_xticklabels([str(v) for v in table.index], rotation=45, ha='right')
+            ax.legend(title=', '.join(group_by[1:]))
+        else:
+            ax.bar([str(v) for v in values.index], values.values)
+            ax.tick_params(axis='x', rotation=45)
+
+        ax.set_title(title)
+        ax.set_ylabel(ylabel)
+
+    for ax in axes[len(metrics):]:
+        ax.set_visible(False)
+
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=dpi, bbox_inches='tight')
+
+
+def _render_worker(render_queue, error_queue):
+    """
+    Renderer process loop: always draws the most recent job, skipping stale ones
+    Render failures are reported back through error_queue and do not stop the loop
+    """
+    while True:
+        job = render_queue.get()
+        stop = job is None
+        # Collapse any backlog to the latest snapshot
+        while not stop:
+            try:
+                newer = render_queue.get_nowait()
+            except queue.Empty:
+                break
+            if newer is None:
+                stop = True
+            else:
+                job = newer
+
+        if job is not None:
+            try:
+                render, args = job
+                render(*args)
+            except Exception as exc:
+                try:
+                    pickle.dumps(exc)
+                except Exception:
+                    exc = RuntimeError(f"Figure rendering failed: {exc!r}")
+                error_queue.put(exc)
+        if stop:
+            return
+
+
+class BackgroundReporter:
+    """
+    Background consumer that aggregates results and renders figures as runs complete
+
+    render is called in the renderer process as render(summary, group_by, metrics, output_path, dpi)
+    and must be a module-level function so that it can be sent to that process
+    """
+
+    def __init__(self, output_path='experimental_results.png', group_by=('method', 'noise_level'),
+                 metrics=DEFAULT_METRICS, min_interval=1.0, dpi=300, render=render_summary):
+        self.output_path = output_path
+        self.render = render
+        self.min_interval = min_interval  # minimum seconds between intermediate renders
+        self.dpi = dpi
+        self.aggregator = IncrementalAggregator(group_by, metrics)
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_render = 0.0
+        self._errors = []
+        self._closed = False
+
+        # Start the renderer before the consumer thread so it forks from a single-threaded state
+        self._render_queue = mp.Queue()
+        self._error_queue = mp.Queue()
+        self._renderer = mp.Process(target=_render_worker,
+                                    args=(self._render_queue, self._error_queue))
+        self._renderer.start()
+        self._thread = threading.Thread(target=self._consume, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+            return
+        # Always stop the renderer process, but never mask the exception already in flight
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def submit(self, row):
+        """
+        Queue a result row; returns immediately
+        """
+        self._queue.put(dict(row))
+
+    def summary(self):
+        """
+        Snapshot of the aggregated statistics
+        """
+        with self._lock:
+            return self.aggregator.to_frame()
+
+    def close(self, wait=True):
+        """
+        Drain the queue, hand the final figure to the renderer and stop the consumer thread
+        With wait=False the final render finishes in the background; call join() to wait for it
+        Raises the first aggregation or rendering error seen so far; safe to call more than once
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+        if wait:
+            self.join()
+        else:
+            self._raise_errors()
+
+    def join(self):
+        """
+        Wait for the renderer process to finish the final figure, raising any error it hit
+        """
+        self._renderer.join()
+        self._raise_errors()
+
+    def _raise_errors(self):
+        while True:
+            try:
+                self._errors.append(self._error_queue.get_nowait())
+            except queue.Empty:
+                break
+        if self._errors:
+            raise self._errors[0]
+
+    def _consume(self):
+        while True:
+            try:
+                row = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            if row is None:
+                # The stop sentinel must reach the renderer even if the final render fails
+                try:
+                    if self._pending:
+                        self._request_render()
+                except Exception as exc:
+                    self._errors.append(exc)
+                finally:
+                    self._render_queue.put(None)
+                return
+
+            # Keep consuming after a bad row so later results are not dropped
+            try:
+                with self._lock:
+                    self.aggregator.update(row)
+                self._pending += 1
+
+                # Throttle intermediate renders and skip them while a backlog is waiting
+                if (time.monotonic() - self._last_render >= self.min_interval
+                        and self._queue.empty()):
+                    self._request_render()
+            except Exception as exc:
+                self._errors.append(exc)
+
+    def _request_render(self):
+        """
+        Send the current statistics to the renderer process
+        """
+        self._pending = 0
+        self._last_render = time.monotonic()
+        self._render_queue.put((self.render, (self.summary(), self.aggregator.group_by,
+                                              self.aggregator.metrics, self.output_path, self.dpi)))
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Compact Results Store for Automotive Sensor Fusion Experiments
+Append-only columnar storage replacing CSV output for large sweeps
+
+This module provides:
+1. Streaming of metric rows to disk as experiment runs complete
+2. Chunked columnar storage (one .npy file per column per chunk) with a JSON schema
+3. Optional storage of fused signals as memory-mapped blocks
+4. Fast filtered reads using per-chunk min/max statistics for chunk pruning
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+
+SCHEMA_FILE = 'schema.json'
+SIGNAL_INDEX_FILE = 'signals.json'
+MAX_VALUE_SET = 64  # string columns with more distinct values per chunk are not pruned
+
+
+class ResultsStore:
+    """
+    Append-only columnar store for experimental results
+
+    Layout on disk:
+        <path>/schema.json                  column names, dtypes and chunk manifest
+        <path>/chunk_00000/<column>.npy     one array per column per chunk
+        <path>/signals/block_00000.npy      fused signals (memory-mapped on read)
+        <path>/signals.json                 signal key -> (block, offset, length)
+    """
+
+    def __init__(self, path, chunk_size=1024, signal_block_size=1 << 22, run_id=None):
+        self.path = path
+        self.run_id = run_id  # when set, every appended row is tagged with this run_id
+        self.chunk_size = chunk_size
+        self.signal_block_size = signal_block_size  # samples per signal block
+        self._buffer = []
+        os.makedirs(os.path.join(self.path, 'signals'), exist_ok=True)
+
+        schema_path = os.path.join(self.path, SCHEMA_FILE)
+        if os.path.exists(schema_path):
+            with open(schema_path) as f:
+                self.schema = json.load(f)
+        else:
+            self.schema = {'columns': {}, 'chunks': []}
+
+        index_path = os.path.join(self.path, SIGNAL_INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                self.signal_index = json.load(f)
+        else:
+            self.signal_index = {'blocks': [], 'signals': {}}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return sum(chunk['rows'] for chunk in self.schema['chunks']) + len(self._buffer)
+
+    @property
+    def columns(self):
+        return list(self.schema['columns'].keys())
+
+    def append(self, row):
+        """
+        Append a single metrics row; flushed to disk once a chunk fills up
+        """
+        if self.run_id is not None:
+            row = {'run_id': self.run_id, **row}
+        self._buffer.append(row)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def extend(self, rows):
+        """
+        Append several metrics rows
+        """
+        for row in rows:
+            self.append(row)
+
+    def flush(self):
+        """
+        Write buffered rows to a new chunk
+        """
+        if not self._buffer:
+            return
+
+        frame = pd.DataFrame(self._buffer)
+        self._buffer = []
+
+        chunk_name = f"chunk_{len(self.schema['chunks']):05d}"
+        chunk_dir = os.path.join(self.path, chunk_name)
+        os.makedirs(chunk_dir, exist_ok=True)
+
+        stats = {}
+        for column in frame.columns:
+            values = self._to_array(column, frame[column])
+            np.save(os.path.join(chunk_dir, f"{column}.npy"), values)
+
+            # Min/max statistics allow whole chunks to be skipped on filtered reads
+            if values.dtype.kind in 'biuf' and len(values):
+                stats[column] = [values.min().item(), values.max().item()]
+            elif values.dtype.kind == 'U' and len(values):
+                # Value sets only pay off for low-cardinality columns such as method names
+                distinct = set(values.tolist())
+                if len(distinct) <= MAX_VALUE_SET:
+                    stats[column] = sorted(distinct)
+
+        self.schema['chunks'].append({'name': chunk_name, 'rows': len(frame), 'stats': stats})
+        # Signals are saved before the rows that reference them, so persisting the index
+        # first keeps every stored signal_key loadable if the process dies later
+        self._write_json(SIGNAL_INDEX_FILE, self.signal_index)
+        self._write_json(SCHEMA_FILE, self.schema)
+
+    def close(self):
+        """
+        Flush pending rows and persist the signal index
+        """
+        self.flush()
+        self._write_json(SIGNAL_INDEX_FILE, self.signal_index)
+
+    def _to_array(self, column, series):
+        """
+        Convert a column to a compact fixed-dtype array, recording its dtype in the schema
+        Numeric columns are widened (never narrowed) when later chunks need a larger dtype
+        Missing string values are stored as '', the same as a column absent from a chunk
+        """
+        known = self.schema['columns'].get(column)
+        is_string = (series.dtype == object or pd.api.types.is_string_dtype(series.dtype)
+                     or (known == 'U' and series.isna().all()))
+        if is_string:
+            values = series.where(series.notna(), '').astype(str).to_numpy(dtype=str)
+        else:
+            values = series.to_numpy()
+
+        if known is None:
+            self.schema['columns'][column] = 'U' if is_string else values.dtype.str
+        elif (known == 'U') != is_string:
+            raise ValueError(f"Column '{column}' cannot change between string and numeric values")
+        elif known != 'U':
+            widened = np.result_type(np.dtype(known), values.dtype)
+            self.schema['columns'][column] = widened.str
+            values = values.astype(widened)
+        return values
+
+    def save_signal(self, key, signal):
+        """
+        Store a fused signal in the current memory-mapped block, returning its key
+        """
+        signal = np.asarray(signal, dtype=np.float64)
+        blocks = self.signal_index['blocks']
+
+        if not blocks or blocks[-1]['used'] + len(signal) > blocks[-1]['capacity']:
+            capacity = max(self.signal_block_size, len(signal))
+            name = f"block_{len(blocks):05d}.npy"
+            block = np.lib.format.open_memmap(
+                os.path.join(self.path, 'signals', name), mode='w+',
+                dtype=np.float64, shape=(capacity,))
+            del block
+            blocks.append({'name': name, 'capacity': capacity, 'used': 0})
+
+        current = blocks[-1]
+        block = np.load(os.path.join(self.path, 'signals', current['name']), mmap_mode='r+')
+        block[current['used']:current['used'] + len(signal)] = signal
+        block.flush()
+        del block
+
+        self.signal_index['signals'][key] = [len(blocks) - 1, current['used'], len(signal)]
+        current['used'] += len(signal)
+        return key
+
+    def load_signal(self, key):
+        """
+        Return a read-only memory-mapped view of a stored fused signal
+        """
+        block_id, offset, length = self.signal_index['signals'][key]
+        name = self.signal_index['blocks'][block_id]['name']
+        block = np.load(os.path.join(self.path, 'signals', name), mmap_mode='r')
+        return block[offset:offset + length]
+
+    def read(self, columns=None, where=None):
+        """
+        Read stored rows into a DataFrame
+
+        columns: subset of columns to load (default: all)
+        where: dict of column -> value, list of values, or (low, high) range
+        """
+        self.flush()
+        where = where or {}
+        columns = list(columns) if columns is not None else self.columns
+        load_columns = list(dict.fromkeys(columns + list(where.keys())))
+
+        frames = []
+        for chunk in self.schema['chunks']:
+            if not self._chunk_may_match(chunk['stats'], where):
+                continue
+
+            chunk_dir = os.path.join(self.path, chunk['name'])
+            data = {}
+            for column in load_columns:
+                column_path = os.path.join(chunk_dir, f"{column}.npy")
+                if os.path.exists(column_path):
+                    data[column] = np.load(column_path)
+                    dtype = self.schema['columns'][column]
+                    if dtype != 'U':
+                        # Earlier chunks may predate a widening of the column dtype
+                        data[column] = data[column].astype(dtype, copy=False)
+                else:
+                    missing = '' if self.schema['columns'].get(column) == 'U' else np.nan
+                    data[column] = np.full(chunk['rows'], missing)
+
+            mask = np.ones(chunk['rows'], dtype=bool)
+            for column, condition in where.items():
+                mask &= self._match(data[column], condition)
+            if mask.any():
+                frames.append(pd.DataFrame({c: data[c][mask] for c in columns}))
+
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)
+
+    def read_run(self, columns=None, where=None):
+        """
+        Read only the rows appended under this store's run_id
+        """
+        if self.run_id is None:
+            return self.read(columns, where)
+        return self.read(columns, {**(where or {}), 'run_id': self.run_id})
+
+    def _chunk_may_match(self, stats, where):
+        """
+        Use chunk statistics to decide whether a chunk can contain matching rows
+        """
+        for column, condition in where.items():
+            if column not in stats:
+                continue
+            column_stats = stats[column]
+
+            if isinstance(condition, tuple):
+                low, high = condition
+                if column_stats[1] < low or column_stats[0] > high:
+                    return False
+            elif isinstance(condition, list):
+                if self.schema['columns'].get(column) == 'U':
+                    if not set(map(str, condition)) & set(column_stats):
+                        return False
+                elif all(v < column_stats[0] or v > column_stats[1] for v in condition):
+                    return False
+            elif self.schema['columns'].get(column) == 'U':
+                if str(condition) not in column_stats:
+                    return False
+            elif condition < column_stats[0] or condition > column_stats[1]:
+                return False
+        return True
+
+    def _match(self, values, condition):
+        """
+        Row mask for a single where-condition
+        """
+        if isinstance(condition, tuple):
+            low, high = condition
+            return (values >= low) & (values <= high)
+        if isinstance(condition, list):
+            return np.isin(values, condition)
+        return values == condition
+
+    def _write_json(self, filename, payload):
+        """
+        Atomically replace a JSON metadata file
+        """
+        target = os.path.join(self.path, filename)
+        tmp_path = target + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp_path, target)